@@ -5,18 +5,71 @@ Runs scrape.py every 5 minutes and sends email notifications for new job posting
 """
 
 import os
+import re
 import json
 import time
+import queue
 import smtplib
+import threading
+from html import escape
 from datetime import datetime
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
+from email.message import EmailMessage
 from typing import List, Dict
-import schedule
 
 # Import the scraping function from scrape.py
 from scrape import scrape_linkedin_jobs
 
+# Path segment after /jobs/view/ (numeric ID or "title-at-company-<id>" slug), up to the next / or ?
+_JOB_ID_RE = re.compile(r"/jobs/view/([^/?]+)")
+_JOB_VIEW_PREFIX = "https://www.linkedin.com/jobs/view/"
+_JOB_VIEW_PREFIX_LEN = len(_JOB_VIEW_PREFIX)
+
+RUN_INTERVAL = 5 * 60  # seconds between runs
+
+# Static parts of the notification email; only the job count in the header varies
+_EMAIL_HEADER = """
+<html>
+<head></head>
+<body>
+    <h2>New LinkedIn Internship Postings</h2>
+    <p>Found <strong>{count}</strong> new internship posting(s):</p>
+    <ul>
+"""
+_EMAIL_FOOTER = """
+    </ul>
+    <p>Happy job hunting!</p>
+    <p><small>This is an automated message from your LinkedIn Internship Bot.</small></p>
+</body>
+</html>
+"""
+
+
+@lru_cache(maxsize=4096)
+def _parse_job_id(link: str) -> str:
+    """
+    Extract the job ID from a LinkedIn job link.
+    
+    Cached because the same postings show up in scrape after scrape.
+    """
+    # Fast path for the usual shape, e.g. https://www.linkedin.com/jobs/view/1234567890/?refId=...
+    if link.startswith(_JOB_VIEW_PREFIX):
+        tail = link[_JOB_VIEW_PREFIX_LEN:]
+        end = len(tail)
+        for sep in '/?':
+            cut = tail.find(sep, 0, end)
+            if cut != -1:
+                end = cut
+        if end:
+            return tail[:end]
+    
+    # Use the job ID from the URL if available (other hosts such as uk.linkedin.com)
+    match = _JOB_ID_RE.search(link)
+    if match:
+        return match.group(1)
+    # Fallback: use cleaned link as ID
+    return link.partition('?')[0]
+
 
 class LinkedInBot:
     def __init__(self, email_config: Dict, linkedin_url: str):
@@ -29,37 +82,110 @@ class LinkedInBot:
         """
         self.email_config = email_config
         self.linkedin_url = linkedin_url
-        self.sent_jobs_file = "sent_jobs.json"
+        self.sent_jobs_file = "sent_jobs.log"
+        self.legacy_sent_jobs_file = "sent_jobs.json"
+        # Lines in the log file, duplicates included; compared against the unique IDs to decide
+        # when to compact
+        self._log_lines = 0
         self.sent_job_ids = self._load_sent_jobs()
+        self._smtp = None
+        self._sent_lock = threading.Lock()
+        
+        # Emails go out on a background thread, started by the first send_email(); see _mail_worker
+        self._mail_queue = queue.Queue()
+        self._mail_thread = None
         
     def _load_sent_jobs(self) -> set:
-        """Load previously sent job IDs from file."""
+        """Load previously sent job IDs from the append-only log (one ID per line)."""
         if os.path.exists(self.sent_jobs_file):
             try:
                 with open(self.sent_jobs_file, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('job_ids', []))
-            except:
+                    lines = f.read().splitlines()
+            except OSError:
                 return set()
+            # Crashes or overlapping runs can leave the same ID on several lines
+            self._log_lines = len(lines)
+            return set(lines)
+        
+        # Migrate IDs from the old JSON store so they aren't emailed again
+        if os.path.exists(self.legacy_sent_jobs_file):
+            try:
+                with open(self.legacy_sent_jobs_file, 'r') as f:
+                    job_ids = set(json.load(f).get('job_ids', []))
+            except (OSError, json.JSONDecodeError):
+                return set()
+            # Write the log now, so the migration doesn't depend on a later email going out
+            try:
+                self._write_log(job_ids)
+            except OSError as e:
+                print(f"Error migrating {self.legacy_sent_jobs_file}: {e}")
+            return job_ids
         return set()
     
-    def _save_sent_jobs(self):
-        """Save sent job IDs to file."""
-        with open(self.sent_jobs_file, 'w') as f:
-            json.dump({'job_ids': list(self.sent_job_ids)}, f)
+    def _save_sent_jobs(self, job_ids: List[str]):
+        """Append the IDs of a delivered batch to the log, compacting it once it holds too many duplicates."""
+        # Nothing to record: skip the open/fsync entirely
+        if not job_ids:
+            return
+        
+        # Runs on the mail worker while the scheduler thread may be filtering the next batch
+        with self._sent_lock:
+            with open(self.sent_jobs_file, 'a') as f:
+                f.write(''.join(f"{job_id}\n" for job_id in job_ids))
+                f.flush()
+                os.fsync(f.fileno())
+            self._log_lines += len(job_ids)
+            
+            if self._log_lines > 2 * len(self.sent_job_ids):
+                self._write_log(self.sent_job_ids)
+    
+    def _write_log(self, job_ids):
+        """Rewrite the log with a single line per job ID. Caller holds _sent_lock once the bot is running."""
+        # Write a temp file and swap it in, so a crash mid-write can't truncate the log
+        tmp_file = self.sent_jobs_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(''.join(f"{job_id}\n" for job_id in job_ids))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.sent_jobs_file)
+        self._log_lines = len(job_ids)
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the cached SMTP connection, reconnecting if it has gone stale."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+        
+        host = self.email_config['smtp_server']
+        port = self.email_config['smtp_port']
+        if port == 465:
+            # Implicit TLS: no STARTTLS round-trip needed
+            server = smtplib.SMTP_SSL(host, port, timeout=30)
+        else:
+            server = smtplib.SMTP(host, port, timeout=30)
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+        server.login(self.email_config['sender'], self.email_config['password'])
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """Close the cached SMTP connection, if any."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
     
     def _get_job_id(self, job: Dict) -> str:
         """Generate a unique ID for a job based on its link."""
-        link = job.get('link', '')
-        # Use the job ID from the URL if available, otherwise use the full link
-        if '/jobs/view/' in link:
-            # Extract job ID from URL like: https://www.linkedin.com/jobs/view/1234567890/
-            parts = link.split('/jobs/view/')
-            if len(parts) > 1:
-                job_id = parts[1].split('/')[0].split('?')[0]
-                return job_id
-        # Fallback: use cleaned link as ID
-        return link.split('?')[0] if '?' in link else link
+        return _parse_job_id(job.get('link', ''))
     
     def filter_new_jobs(self, jobs: List[Dict]) -> List[Dict]:
         """
@@ -71,23 +197,22 @@ class LinkedInBot:
         Returns:
             List of new jobs that haven't been sent yet
         """
+        sent = self.sent_job_ids
+        ids = list(map(self._get_job_id, jobs))
         new_jobs = []
         
-        for job in jobs:
-            job_id = self._get_job_id(job)
-            
-            # Skip if we've already sent this job
-            if job_id in self.sent_job_ids:
-                continue
-            
-            new_jobs.append(job)
-            self.sent_job_ids.add(job_id)
-        
+        with self._sent_lock:
+            for job_id, job in zip(ids, jobs):
+                # Marking each ID as it is kept also drops repeats of the same job within this batch
+                if job_id in sent:
+                    continue
+                sent.add(job_id)
+                new_jobs.append(job)
         return new_jobs
     
     def send_email(self, jobs: List[Dict]):
         """
-        Send email with new job listings.
+        Queue an email with new job listings for the background mail worker.
         
         Args:
             jobs: List of job dictionaries to include in email
@@ -96,62 +221,87 @@ class LinkedInBot:
             print("No new jobs to send.")
             return
         
+        if self._mail_thread is None:
+            self._mail_thread = threading.Thread(target=self._mail_worker, daemon=True)
+            self._mail_thread.start()
+        self._mail_queue.put(jobs)
+    
+    def wait_for_emails(self):
+        """Block until every queued email has been handled."""
+        self._mail_queue.join()
+    
+    def _mail_worker(self):
+        """Send queued emails one at a time, so a slow SMTP server never delays a scrape."""
+        while True:
+            jobs = self._mail_queue.get()
+            try:
+                self._send_email_now(jobs)
+            finally:
+                self._mail_queue.task_done()
+    
+    def _send_email_now(self, jobs: List[Dict]):
+        """
+        Build and send the email with new job listings.
+        
+        Args:
+            jobs: List of job dictionaries to include in email
+        """
+        # Only this batch is recorded as sent, never IDs from batches still waiting in the queue
+        job_ids = [self._get_job_id(job) for job in jobs]
+        
         try:
             # Create email
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg['From'] = self.email_config['sender']
             msg['To'] = self.email_config['recipient']
             msg['Subject'] = f"New LinkedIn Internships - {len(jobs)} New Posting(s)"
             
             # Create email body
-            body = f"""
-            <html>
-            <head></head>
-            <body>
-                <h2>New LinkedIn Internship Postings</h2>
-                <p>Found <strong>{len(jobs)}</strong> new internship posting(s):</p>
-                <ul>
-            """
+            parts = [_EMAIL_HEADER.format(count=len(jobs))]
             
+            added = []
             for job in jobs:
                 title = job.get('title', 'Unknown Job')
                 company = job.get('company', 'Company not found')
                 link = job.get('link', '#')
-                # Debug: print job data
-                print(f"  Adding job: {title} at {company}")
-                body += f"""
+                added.append(f"{title} at {company}")
+                parts.append(f"""
                     <li style="margin-bottom: 15px;">
-                        <strong>{title}</strong><br>
-                        <strong>Company:</strong> {company}<br>
-                        <a href="{link}">View Job on LinkedIn</a>
+                        <strong>{escape(title)}</strong><br>
+                        <strong>Company:</strong> {escape(company)}<br>
+                        <a href="{escape(link)}">View Job on LinkedIn</a>
                     </li>
-                """
+                """)
             
-            body += """
-                </ul>
-                <p>Happy job hunting!</p>
-                <p><small>This is an automated message from your LinkedIn Internship Bot.</small></p>
-            </body>
-            </html>
-            """
+            parts.append(_EMAIL_FOOTER)
+            body = "".join(parts)
+            # Debug: print job data
+            print(f"  Adding {len(added)} job(s):\n    " + "\n    ".join(added))
             
-            msg.attach(MIMEText(body, 'html'))
+            msg.set_content(body, subtype='html')
             
             # Send email
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['sender'], self.email_config['password'])
-            text = msg.as_string()
-            server.sendmail(self.email_config['sender'], self.email_config['recipient'], text)
-            server.quit()
-            
-            print(f"✓ Email sent successfully with {len(jobs)} jobs!")
-            self._save_sent_jobs()
+            try:
+                self._get_smtp().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the idle connection; reconnect once and retry
+                self._close_smtp()
+                self._get_smtp().send_message(msg)
             
         except Exception as e:
             print(f"✗ Error sending email: {e}")
             import traceback
             traceback.print_exc()
+            # Not delivered: unmark the batch so the next run picks these jobs up again
+            with self._sent_lock:
+                self.sent_job_ids.difference_update(job_ids)
+            return
+        
+        print(f"✓ Email sent successfully with {len(jobs)} jobs!")
+        try:
+            self._save_sent_jobs(job_ids)
+        except OSError as e:
+            print(f"✗ Error saving sent jobs: {e}")
     
     def run(self):
         """Run one iteration of the bot: scrape, filter, and send email."""
@@ -160,7 +310,7 @@ class LinkedInBot:
         try:
             # Scrape jobs
             print("Scraping LinkedIn for new jobs...")
-            jobs = scrape_linkedin_jobs(self.linkedin_url)
+            jobs = list(scrape_linkedin_jobs(self.linkedin_url))
             print(f"Found {len(jobs)} total jobs")
             
             # Filter for new jobs
@@ -188,17 +338,19 @@ class LinkedInBot:
         print("Press Ctrl+C to stop.")
         print("=" * 60)
         
-        # Schedule to run every 5 minutes
-        schedule.every(5).minutes.do(self.run)
-        
-        # Run immediately on start
         print("\nRunning initial scrape...")
-        self.run()
         
-        # Keep running
+        # Run immediately, then every RUN_INTERVAL seconds on a fixed monotonic grid so the
+        # interval doesn't drift by each run's duration; sleep the whole gap in one call
+        next_run = time.monotonic()
         while True:
-            schedule.run_pending()
-            time.sleep(30)  # Check every 30 seconds
+            self.run()
+            next_run += RUN_INTERVAL
+            now = time.monotonic()
+            if next_run < now:
+                # A run overran its slot: skip the missed slots instead of running back to back
+                next_run += ((now - next_run) // RUN_INTERVAL + 1) * RUN_INTERVAL
+            time.sleep(next_run - now)
 
 
 def main():
@@ -240,6 +392,8 @@ def main():
         bot.start_scheduler()
     except KeyboardInterrupt:
         print("\n\nStopping bot...")
+        bot.wait_for_emails()
+        bot._close_smtp()
         print("Goodbye!")
 
 
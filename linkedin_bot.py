@@ -5,20 +5,64 @@ Scrapes LinkedIn for new internship postings and sends hourly email updates.
 """
 
 import os
+import re
+import atexit
 import json
 import time
 import smtplib
+from html import escape
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from typing import List, Dict
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import schedule
+from urllib.parse import urlparse, parse_qsl
+from selectolax.lexbor import LexborHTMLParser
+import requests
+
+
+# Public endpoint behind LinkedIn's logged-out job search; returns the job cards as static HTML
+GUEST_JOBS_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+PAGE_SIZE = 25
+MAX_JOBS = 50
+RUN_INTERVAL = 60 * 60  # seconds between runs
+
+# Relative posting time such as "5 minutes ago", "1 hour ago" or "an hour ago"
+_TIME_AGO_RE = re.compile(r"(?:(\d+)|\ban?)\s*(second|minute|hour)", re.IGNORECASE)
+_JUST_NOW_RE = re.compile(r"\bnow\b", re.IGNORECASE)
+
+# Static parts of the notification email; only the job count in the header varies
+_EMAIL_HEADER = """
+<html>
+<head></head>
+<body>
+    <h2>New LinkedIn Internship Postings (Past Hour)</h2>
+    <p>Found <strong>{count}</strong> new internship posting(s) in the past hour:</p>
+    <ul>
+"""
+_EMAIL_FOOTER = """
+    </ul>
+    <p>Happy job hunting!</p>
+</body>
+</html>
+"""
+
+# Per-field selectors, each a single CSS selector list so every field is one lookup per card
+# (css_first() returns the first match in document order)
+# Cards are either a div wrapping the job link or the <a class="base-card ..."> link itself
+_CARD_SEL = ".base-card"
+_TITLE_SEL = ("h3.base-search-card__title, h3.job-search-card__title, "
+              "a.job-search-card__title-link, span.job-search-card__title")
+_COMPANY_SEL = ("h4.base-search-card__subtitle, h4.job-search-card__subtitle, "
+                "a.job-search-card__subtitle-link")
+_LOCATION_SEL = "span.job-search-card__location, span.base-search-card__metadata"
+_LINK_SEL = "a[href*='/jobs/view/']"
+_TIME_SEL = "time, span.job-search-card__listdate"
+
+
+def _first_text(card, selector: str) -> str:
+    """Whitespace-normalized text of the first node matching selector under card, or ''."""
+    node = card.css_first(selector)
+    return " ".join(node.text().split()) if node else ""
 
 
 class LinkedInBot:
@@ -32,45 +76,115 @@ class LinkedInBot:
         """
         self.email_config = email_config
         self.linkedin_url = linkedin_url
-        self.sent_jobs_file = "sent_jobs.json"
+        self.sent_jobs_file = "sent_jobs.log"
+        self.legacy_sent_jobs_file = "sent_jobs.json"
+        self._new_ids_since_save = []
+        # Lines in the log file, duplicates included; compared against the unique IDs to decide
+        # when to compact
+        self._log_lines = 0
         self.sent_job_ids = self._load_sent_jobs()
-        self.driver = None
+        self._smtp = None
+        self.session = None
         
     def _load_sent_jobs(self) -> set:
-        """Load previously sent job IDs from file."""
+        """Load previously sent job IDs from the append-only log (one ID per line)."""
         if os.path.exists(self.sent_jobs_file):
             try:
                 with open(self.sent_jobs_file, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('job_ids', []))
-            except:
+                    lines = f.read().splitlines()
+            except OSError:
+                return set()
+            # Crashes or overlapping runs can leave the same ID on several lines
+            self._log_lines = len(lines)
+            return set(lines)
+        
+        # Migrate IDs from the old JSON store so they aren't emailed again
+        if os.path.exists(self.legacy_sent_jobs_file):
+            try:
+                with open(self.legacy_sent_jobs_file, 'r') as f:
+                    job_ids = set(json.load(f).get('job_ids', []))
+            except (OSError, json.JSONDecodeError):
                 return set()
+            # Write the log now, so the migration doesn't depend on a later email going out
+            try:
+                self._write_log(job_ids)
+            except OSError as e:
+                print(f"Error migrating {self.legacy_sent_jobs_file}: {e}")
+            return job_ids
         return set()
     
     def _save_sent_jobs(self):
-        """Save sent job IDs to file."""
-        with open(self.sent_jobs_file, 'w') as f:
-            json.dump({'job_ids': list(self.sent_job_ids)}, f)
+        """Append newly sent job IDs to the log, compacting it once it holds too many duplicates."""
+        # Nothing new since the last save: skip the open/fsync entirely
+        if not self._new_ids_since_save:
+            return
+        
+        with open(self.sent_jobs_file, 'a') as f:
+            f.write(''.join(f"{job_id}\n" for job_id in self._new_ids_since_save))
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_lines += len(self._new_ids_since_save)
+        self._new_ids_since_save = []
+        
+        if self._log_lines > 2 * len(self.sent_job_ids):
+            self._write_log(self.sent_job_ids)
+    
+    def _write_log(self, job_ids):
+        """Rewrite the log with a single line per job ID."""
+        # Write a temp file and swap it in, so a crash mid-write can't truncate the log
+        tmp_file = self.sent_jobs_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(''.join(f"{job_id}\n" for job_id in job_ids))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.sent_jobs_file)
+        self._log_lines = len(job_ids)
     
-    def _setup_driver(self):
-        """Setup Selenium WebDriver with Chrome."""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in background
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the cached SMTP connection, reconnecting if it has gone stale."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        host = self.email_config['smtp_server']
+        port = self.email_config['smtp_port']
+        if port == 465:
+            # Implicit TLS: no STARTTLS round-trip needed
+            server = smtplib.SMTP_SSL(host, port, timeout=30)
+        else:
+            server = smtplib.SMTP(host, port, timeout=30)
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+        server.login(self.email_config['sender'], self.email_config['password'])
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """Close the cached SMTP connection, if any."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
     
-    def _close_driver(self):
-        """Close the WebDriver."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+    def _get_session(self) -> requests.Session:
+        """Return the HTTP session kept open across runs, so the connection to LinkedIn stays warm."""
+        if self.session is None:
+            self.session = requests.Session()
+            self.session.headers['User-Agent'] = USER_AGENT
+        return self.session
+    
+    def _close_session(self):
+        """Close the HTTP session, if any."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
     
     def _is_past_hour(self, time_text: str) -> bool:
         """
@@ -82,194 +196,81 @@ class LinkedInBot:
         Returns:
             True if posted in the past hour, False otherwise
         """
-        time_text = time_text.lower().strip()
-        
-        # Check for "hour ago" or "hours ago"
-        if "hour ago" in time_text or "hours ago" in time_text:
-            # Extract number
-            try:
-                # Handle "1 hour ago" or "2 hours ago"
-                parts = time_text.split()
-                if len(parts) >= 2:
-                    num = int(parts[0])
-                    return num == 1  # Only "1 hour ago" or "hour ago" (which we'll treat as 1)
-            except:
-                pass
-        
-        # Check for minutes (anything with "minute" is within the hour)
-        if "minute" in time_text:
-            return True
+        match = _TIME_AGO_RE.search(time_text)
+        if not match:
+            # "just now" or similar
+            return _JUST_NOW_RE.search(time_text) is not None
         
-        # Check for "just now" or similar
-        if "just now" in time_text or "now" in time_text:
-            return True
-        
-        return False
+        count, unit = match.group(1), match.group(2).lower()
+        if unit == "hour":
+            # Only "1 hour ago" ("an hour ago" counts as 1)
+            return count is None or int(count) == 1
+        # Anything in seconds or minutes is within the hour
+        return True
+    
+    def _search_params(self) -> Dict[str, str]:
+        """Extract the search filters (keywords, f_TPR, f_E, ...) from the configured URL."""
+        return dict(parse_qsl(urlparse(self.linkedin_url).query))
     
     def scrape_jobs(self) -> List[Dict]:
         """
-        Scrape LinkedIn jobs from the configured URL.
+        Scrape LinkedIn jobs for the configured search via the public guest jobs endpoint.
         
         Returns:
             List of job dictionaries with title, company, location, link, and time
         """
         jobs = []
+        params = self._search_params()
         
         try:
-            self._setup_driver()
-            print(f"Navigating to: {self.linkedin_url}")
-            self.driver.get(self.linkedin_url)
+            session = self._get_session()
+            print(f"Fetching jobs for: {self.linkedin_url}")
             
-            # Wait for job listings to load
-            time.sleep(5)  # Give page time to load
-            
-            # Try to find job cards - LinkedIn uses various selectors
-            # Common selectors for job listings
-            job_selectors = [
-                "div.job-search-card",
-                "div.base-card",
-                "li.jobs-search-results__list-item",
-                "div[data-job-id]"
-            ]
-            
-            job_elements = []
-            for selector in job_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        job_elements = elements
-                        print(f"Found {len(elements)} jobs using selector: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not job_elements:
-                print("No job elements found. Page might require login or have changed structure.")
-                print("Trying alternative approach...")
-                # Try to get all links that might be job postings
-                job_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/jobs/view/']")
-            
-            for element in job_elements[:50]:  # Limit to first 50 to avoid timeout
-                try:
-                    # Extract job information
-                    job_data = {}
-                    
-                    # Try to get job title
-                    title_selectors = [
-                        "h3.base-search-card__title",
-                        "h3.job-search-card__title",
-                        "a.job-search-card__title-link",
-                        "span.job-search-card__title"
-                    ]
-                    
-                    title = None
-                    for title_sel in title_selectors:
-                        try:
-                            title_elem = element.find_element(By.CSS_SELECTOR, title_sel)
-                            title = title_elem.text.strip()
-                            break
-                        except:
-                            continue
-                    
-                    if not title:
-                        # Try to get text from the element itself
-                        title = element.text.split('\n')[0] if element.text else "Unknown"
-                    
-                    # Try to get company name
-                    company_selectors = [
-                        "h4.base-search-card__subtitle",
-                        "h4.job-search-card__subtitle",
-                        "a.job-search-card__subtitle-link"
-                    ]
-                    
-                    company = "Unknown"
-                    for company_sel in company_selectors:
-                        try:
-                            company_elem = element.find_element(By.CSS_SELECTOR, company_sel)
-                            company = company_elem.text.strip()
-                            break
-                        except:
-                            continue
-                    
-                    # Try to get location
-                    location_selectors = [
-                        "span.job-search-card__location",
-                        "span.base-search-card__metadata"
-                    ]
-                    
-                    location = "Unknown"
-                    for loc_sel in location_selectors:
-                        try:
-                            loc_elem = element.find_element(By.CSS_SELECTOR, loc_sel)
-                            location = loc_elem.text.strip()
-                            break
-                        except:
-                            continue
-                    
-                    # Try to get job link
-                    link = None
+            # The endpoint serves 25 cards per request; page through with start=0,25,...
+            for start in range(0, MAX_JOBS, PAGE_SIZE):
+                params['start'] = start
+                response = session.get(GUEST_JOBS_URL, params=params, timeout=15)
+                response.raise_for_status()
+                if not response.text.strip():
+                    break
+                
+                cards = LexborHTMLParser(response.text).css(_CARD_SEL)
+                print(f"Found {len(cards)} jobs at offset {start}")
+                
+                for card in cards:
+                    # One guard per card, so a malformed card is logged and skipped rather than
+                    # ending the whole scrape
                     try:
-                        link_elem = element.find_element(By.CSS_SELECTOR, "a[href*='/jobs/view/']")
-                        link = link_elem.get_attribute('href')
-                    except:
-                        # Try to get href from the element itself
-                        try:
-                            link = element.get_attribute('href')
-                        except:
-                            pass
-                    
-                    # Try to get time posted
-                    time_selectors = [
-                        "time.job-search-card__listdate",
-                        "time[datetime]",
-                        "span.job-search-card__listdate"
-                    ]
-                    
-                    time_posted = "Unknown"
-                    for time_sel in time_selectors:
-                        try:
-                            time_elem = element.find_element(By.CSS_SELECTOR, time_sel)
-                            time_posted = time_elem.text.strip() or time_elem.get_attribute('datetime')
-                            break
-                        except:
-                            continue
-                    
-                    # If we couldn't find time, try looking for "ago" text in the element
-                    if time_posted == "Unknown":
-                        element_text = element.text
-                        if "ago" in element_text.lower():
-                            # Extract the time portion
-                            lines = element_text.split('\n')
-                            for line in lines:
-                                if "ago" in line.lower():
-                                    time_posted = line.strip()
-                                    break
-                    
-                    if title and title != "Unknown":
-                        # Create a unique ID for this job
-                        job_id = f"{title}_{company}_{location}".replace(" ", "_").lower()
-                        
-                        job_data = {
-                            'id': job_id,
-                            'title': title,
-                            'company': company,
-                            'location': location,
-                            'link': link or self.linkedin_url,
-                            'time_posted': time_posted
-                        }
+                        title = _first_text(card, _TITLE_SEL)
+                        company = _first_text(card, _COMPANY_SEL) or "Unknown"
+                        location = _first_text(card, _LOCATION_SEL) or "Unknown"
+                        link_elem = card if card.tag == 'a' else card.css_first(_LINK_SEL)
+                        link = (link_elem.attributes.get('href') if link_elem else None) or self.linkedin_url
+                        time_posted = _first_text(card, _TIME_SEL) or "Unknown"
                         
-                        jobs.append(job_data)
+                        if title:
+                            # Create a unique ID for this job
+                            job_id = f"{title}_{company}_{location}".replace(" ", "_").lower()
+                            
+                            jobs.append({
+                                'id': job_id,
+                                'title': title,
+                                'company': company,
+                                'location': location,
+                                'link': link,
+                                'time_posted': time_posted
+                            })
+                    except Exception as e:
+                        print(f"Error extracting job data: {e}")
+                        continue
                 
-                except Exception as e:
-                    print(f"Error extracting job data: {e}")
-                    continue
+                if len(cards) < PAGE_SIZE:
+                    break
             
             print(f"Scraped {len(jobs)} jobs total")
             
         except Exception as e:
             print(f"Error scraping jobs: {e}")
-        finally:
-            self._close_driver()
         
         return jobs
     
@@ -297,6 +298,7 @@ class LinkedInBot:
             if self._is_past_hour(time_posted):
                 new_jobs.append(job)
                 self.sent_job_ids.add(job_id)
+                self._new_ids_since_save.append(job_id)
         
         return new_jobs
     
@@ -313,49 +315,38 @@ class LinkedInBot:
         
         try:
             # Create email
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg['From'] = self.email_config['sender']
             msg['To'] = self.email_config['recipient']
             msg['Subject'] = f"New LinkedIn Internships - {len(jobs)} New Posting(s)"
             
             # Create email body
-            body = f"""
-            <html>
-            <head></head>
-            <body>
-                <h2>New LinkedIn Internship Postings (Past Hour)</h2>
-                <p>Found <strong>{len(jobs)}</strong> new internship posting(s) in the past hour:</p>
-                <ul>
-            """
+            parts = [_EMAIL_HEADER.format(count=len(jobs))]
             
             for job in jobs:
-                body += f"""
+                parts.append(f"""
                     <li>
-                        <strong>{job['title']}</strong><br>
-                        Company: {job['company']}<br>
-                        Location: {job['location']}<br>
-                        Posted: {job['time_posted']}<br>
-                        <a href="{job['link']}">View Job</a>
+                        <strong>{escape(job['title'])}</strong><br>
+                        Company: {escape(job['company'])}<br>
+                        Location: {escape(job['location'])}<br>
+                        Posted: {escape(job['time_posted'])}<br>
+                        <a href="{escape(job['link'])}">View Job</a>
                     </li>
                     <br>
-                """
+                """)
             
-            body += """
-                </ul>
-                <p>Happy job hunting!</p>
-            </body>
-            </html>
-            """
+            parts.append(_EMAIL_FOOTER)
+            body = "".join(parts)
             
-            msg.attach(MIMEText(body, 'html'))
+            msg.set_content(body, subtype='html')
             
             # Send email
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['sender'], self.email_config['password'])
-            text = msg.as_string()
-            server.sendmail(self.email_config['sender'], self.email_config['recipient'], text)
-            server.quit()
+            try:
+                self._get_smtp().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the idle connection; reconnect once and retry
+                self._close_smtp()
+                self._get_smtp().send_message(msg)
             
             print(f"Email sent successfully with {len(jobs)} jobs!")
             self._save_sent_jobs()
@@ -383,16 +374,21 @@ class LinkedInBot:
         print("Bot will run every hour.")
         print("Press Ctrl+C to stop.")
         
-        # Schedule to run every hour
-        schedule.every().hour.do(self.run)
-        
-        # Run immediately on start
-        self.run()
+        # One HTTP session is reused by every run; make sure it is closed however we exit
+        self._get_session()
+        atexit.register(self._close_session)
         
-        # Keep running
+        # Run immediately, then every RUN_INTERVAL seconds on a fixed monotonic grid so the
+        # interval doesn't drift by each run's duration; sleep the whole gap in one call
+        next_run = time.monotonic()
         while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            self.run()
+            next_run += RUN_INTERVAL
+            now = time.monotonic()
+            if next_run < now:
+                # A run overran its slot: skip the missed slots instead of running back to back
+                next_run += ((now - next_run) // RUN_INTERVAL + 1) * RUN_INTERVAL
+            time.sleep(next_run - now)
 
 
 def main():
@@ -429,7 +425,8 @@ def main():
         bot.start_scheduler()
     except KeyboardInterrupt:
         print("\nStopping bot...")
-        bot._close_driver()
+        bot._close_session()
+        bot._close_smtp()
 
 
 if __name__ == "__main__":
@@ -4,53 +4,411 @@ LinkedIn Job Scraper
 Scrapes LinkedIn job postings and returns job titles with their links.
 """
 
-import time
+import os
 import re
+import random
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import List, Dict
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Optional
+from urllib.parse import urlparse, parse_qsl
+import requests
+from selectolax.lexbor import LexborHTMLParser
+
+# Job slugs in /jobs/view/ links: "<title>-at-<company>-<id>" (split at the last "-at-") or "<title>-<id>"
+_JOB_SLUG_RE = re.compile(r'/jobs/view/(?P<title>[^/?]+)-at-(?P<company>[^/?]+?)-(?P<id>\d+)(?:[/?]|$)')
+_JOB_SLUG_NO_COMPANY_RE = re.compile(r'/jobs/view/(?P<title>[^/?]+?)-(?P<id>\d+)(?:[/?]|$)')
+# Card text lines that are UI chrome rather than a job title (substring match, any case)
+_SKIP_RE = re.compile(r'view job|apply|save|company|location|ago|minute|hour', re.I)
+
+# Upper bound on concurrent Chrome instances in scrape_many(); more tends to exhaust memory
+MAX_BROWSERS = 4
+
+# Selectors for the browser fallback; the title and company lists go most specific first, but are
+# each joined into one selector list so a card is only walked once per field
+_JOB_LINK_SEL = "a[href*='/jobs/view/']"
+_JOB_CARD_SEL = "div.base-card, li.jobs-search-results__list-item, " + _JOB_LINK_SEL
+# Containers closest() walks up to from a job link, ending at the innermost list item
+_PARENT_SEL = ("div.job-search-card, div.base-card, li.jobs-search-results__list-item, "
+               "div[data-job-id], div.job-result-card, li")
+_TITLE_SEL = ("h3.base-search-card__title, h3.job-search-card__title, h3.job-result-card__title, "
+              "h2.job-result-card__title, h3[class*='title'], h2[class*='title'], "
+              "a.job-search-card__title-link, span.job-search-card__title, h3, h2")
+_COMPANY_SEL = ("h4.base-search-card__subtitle, h4.job-search-card__subtitle, "
+                "a.job-search-card__subtitle-link, h4[class*='subtitle'], "
+                "span[class*='company'], div[class*='company']")
+
+# Collects every job link together with the text of its job card in a single in-page script,
+# instead of one WebDriver round-trip per element and selector. Takes the selectors above as
+# execute_script() arguments.
+_EXTRACT_JOBS_JS = """
+    const SKIP = ['view job', 'apply', 'save'];
+    const [LINK_SELECTOR, PARENT_SELECTOR, TITLE_SELECTOR, COMPANY_SELECTOR] = arguments;
+    
+    return Array.from(document.querySelectorAll(LINK_SELECTOR), a => {
+        const linkText = (a.innerText || '').trim();
+        // Native closest() walk up to the job card, falling back to the link's parent
+        const card = a.closest(PARENT_SELECTOR) || a.parentElement;
+        const isTitle = text => text.length > 3 && text !== linkText && !SKIP.includes(text.toLowerCase());
+        
+        // First element matching the selector whose text passes the check
+        const firstMatching = (selector, ok) => {
+            for (const el of card.querySelectorAll(selector)) {
+                const text = (el.innerText || '').trim();
+                if (ok(text)) return text;
+            }
+            return null;
+        };
+        const cardAria = Array.from(card.querySelectorAll("[aria-label]"), el => el.getAttribute("aria-label"))
+            .find(label => label.length > 3 && label.toLowerCase().includes("job"));
+        
+        return {
+            href: a.href,
+            text: linkText,
+            aria: a.getAttribute("aria-label"),
+            title: firstMatching(TITLE_SELECTOR, isTitle)
+                || firstMatching("h1, h2, h3, h4", text => text.length > 3 && text !== linkText)
+                || firstMatching("span[class*='title'], div[class*='title'], span[aria-label], div[aria-label]", isTitle),
+            cardAria: cardAria || null,
+            cardText: card.innerText || '',
+            dataTitle: card.getAttribute("data-job-title"),
+            company: firstMatching(COMPANY_SELECTOR, text => text.length > 1)
+        };
+    });
+"""
+
+# Public endpoint behind LinkedIn's logged-out job search; returns the job cards as static HTML
+GUEST_JOBS_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+# The endpoint serves 25 cards per start= offset
+GUEST_PAGE_SIZE = 25
+# Default results paged through per search: five requests, which suits a poll every few minutes.
+# Pass max_results (or set MAX_RESULTS for the CLI) to go further; LinkedIn stops at ~1000
+GUEST_MAX_RESULTS = 125
+# Guest API requests in flight at once across all searches (scrape_many() included); keep low
+# to stay clear of HTTP 429s
+GUEST_PAGE_WORKERS = 4
+_GUEST_REQUEST_SLOTS = threading.BoundedSemaphore(GUEST_PAGE_WORKERS)
+# Rotated per guest API request
+USER_AGENTS = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+)
 
 
 def setup_driver():
     """Setup Selenium WebDriver with Chrome."""
     chrome_options = Options()
-    # Remove headless mode so you can see what's happening (comment out if you want headless)
-    # chrome_options.add_argument('--headless')
+    # Run headless (no rasterising/compositing); set HEADFUL=1 to watch the browser while debugging
+    if os.getenv('HEADFUL') != '1':
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    # Skip background work a throwaway scraping profile never needs
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--metrics-recording-only')
+    chrome_options.add_argument('--mute-audio')
+    chrome_options.add_argument('--no-first-run')
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     
+    # Only the DOM is scraped, so skip downloading images, stylesheets, fonts and media
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+    })
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    # Also skip the FLoC/interest-cohort computation, which does nothing useful for a scraper
+    chrome_options.add_argument('--disable-features=AutomationControlled,InterestCohort')
+    # Return from driver.get() at DOMContentLoaded instead of waiting for every subresource
+    chrome_options.page_load_strategy = 'eager'
+    
     driver = webdriver.Chrome(options=chrome_options)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     return driver
 
 
-def scrape_linkedin_jobs(url: str) -> List[Dict[str, str]]:
+class DriverPool:
     """
-    Scrape LinkedIn jobs from the given URL.
+    A pool of reusable Chrome drivers.
+    
+    Drivers are started on demand, up to `size` of them, and are reset to about:blank
+    instead of quit when released, so repeated scrapes don't pay Chrome's startup cost.
+    """
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._idle = []
+        self._drivers = []
+        self._started = 0
+        # Guards the fields above; notified whenever a driver is returned or a slot frees up
+        self._cond = threading.Condition()
+    
+    def acquire(self):
+        """Take an idle driver, starting a new one if the pool is not full yet."""
+        with self._cond:
+            # Pool is full: wait for another thread to release its driver or give up its slot
+            while not self._idle and self._started >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        
+        try:
+            driver = setup_driver()
+        except Exception:
+            with self._cond:
+                self._started -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._drivers.append(driver)
+        return driver
+    
+    def release(self, driver):
+        """Reset a driver and return it to the pool."""
+        try:
+            driver.get('about:blank')
+        except WebDriverException:
+            # The browser died; drop it and wake a waiter so it can start a fresh one
+            with self._cond:
+                self._drivers.remove(driver)
+                self._started -= 1
+                self._cond.notify()
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+    
+    def close(self):
+        """Quit every driver the pool has started."""
+        with self._cond:
+            drivers, self._drivers = self._drivers, []
+            self._idle = []
+            self._started = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def fetch_via_guest_api(keywords: str, location: str = '', start: int = 0,
+                        filters: Optional[Dict[str, str]] = None,
+                        session: Optional[requests.Session] = None) -> Optional[List[Dict[str, str]]]:
+    """
+    Fetch one page of job cards from LinkedIn's public guest jobs endpoint.
+    
+    This is plain HTTP plus a C-backed HTML parse: no browser, no JavaScript, no images.
+    
+    Args:
+        keywords: Search keywords
+        location: Optional location filter
+        start: Offset of the first result (a multiple of GUEST_PAGE_SIZE)
+        filters: Any other search URL parameters to pass through (f_TPR, f_E, geoId, ...)
+        session: Optional requests.Session to reuse connections across pages
+    
+    Returns:
+        List of dictionaries with 'title', 'company' and 'link' keys (empty if the page has no
+        cards), or None if LinkedIn rate-limited the request (HTTP 429)
+    """
+    params = dict(filters or {})
+    params['keywords'] = keywords
+    if location:
+        params['location'] = location
+    params['start'] = start
+    
+    with _GUEST_REQUEST_SLOTS:
+        response = (session or requests).get(GUEST_JOBS_URL, params=params, timeout=15,
+                                headers={'User-Agent': random.choice(USER_AGENTS)})
+    if response.status_code == 429:
+        return None
+    response.raise_for_status()
+    
+    jobs = []
+    tree = LexborHTMLParser(response.text)
+    for card in tree.css(".base-card"):
+        # The card is either a div wrapping an a.base-card__full-link, or the link itself
+        link_elem = card if card.tag == 'a' else card.css_first("a.base-card__full-link, a[href*='/jobs/view/']")
+        href = link_elem.attributes.get('href') if link_elem else None
+        if not href:
+            continue
+        
+        title_elem = card.css_first("h3.base-search-card__title")
+        company_elem = card.css_first("h4.base-search-card__subtitle")
+        jobs.append({
+            'title': (title_elem.text(strip=True) if title_elem else '') or "Job Listing (Title not found)",
+            'company': (company_elem.text(strip=True) if company_elem else '') or "Company not found",
+            'link': href
+        })
+    return jobs
+
+
+def scrape_via_guest_api(url: str, max_results: int = GUEST_MAX_RESULTS) -> Optional[List[Dict[str, str]]]:
+    """
+    Scrape the search described by a LinkedIn jobs URL through the guest jobs endpoint.
+    
+    Pages through the results with the endpoint's start= offset until a page comes back short
+    (fewer than GUEST_PAGE_SIZE cards), a request fails, LinkedIn rate-limits us, or
+    max_results is reached. The first page is fetched on its own since most searches fit on
+    it; after that up to GUEST_PAGE_WORKERS pages are fetched at a time. Pages before the one
+    that stopped the scrape are kept.
     
     Args:
         url: LinkedIn jobs search URL
+        max_results: Maximum number of results to page through (rounded up to whole pages)
     
     Returns:
-        List of dictionaries with 'title' and 'link' keys
+        List of job dictionaries, or None if the endpoint is unavailable or rate-limited
+        before returning anything
     """
+    filters = dict(parse_qsl(urlparse(url).query))
+    keywords = filters.pop('keywords', '')
+    location = filters.pop('location', '')
+    filters.pop('start', None)
+    
     jobs = []
-    driver = None
+    # Pages can overlap as new postings shift the results, so dedupe on the query-stripped link
+    seen_links = set()
+    offsets = range(0, max_results, GUEST_PAGE_SIZE)
+    
+    # requests.Session isn't guaranteed to be thread-safe, so each worker thread gets its own
+    local = threading.local()
+    sessions = []
+    
+    def fetch_page(start):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+            sessions.append(session)
+        return fetch_via_guest_api(keywords, location, start, filters, session)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=GUEST_PAGE_WORKERS) as executor:
+            i = 0
+            finished = False
+            while i < len(offsets) and not finished:
+                wave = offsets[i:i + (GUEST_PAGE_WORKERS if i else 1)]
+                i += len(wave)
+                futures = [executor.submit(fetch_page, start) for start in wave]
+                
+                # Read the pages in offset order so one failed page doesn't discard those before it
+                for future in futures:
+                    try:
+                        page = future.result()
+                    except requests.RequestException as e:
+                        print(f"Guest API request failed: {e}")
+                        finished = True
+                        break
+                    if page is None:
+                        print("Guest API rate-limited the request (HTTP 429)")
+                        finished = True
+                        break
+                    for job in page:
+                        clean_link = job['link'].partition('?')[0]
+                        if clean_link not in seen_links:
+                            seen_links.add(clean_link)
+                            jobs.append(job)
+                    if len(page) < GUEST_PAGE_SIZE:
+                        # A short page is the last one
+                        finished = True
+                        break
+                
+                if finished:
+                    # Don't send requests for later pages of this wave that haven't started yet
+                    for future in futures:
+                        future.cancel()
+    finally:
+        for session in sessions:
+            session.close()
+    
+    if not jobs:
+        return None
+    print(f"Guest API returned {len(jobs)} job postings")
+    return jobs
+
+
+def scrape_linkedin_jobs(url: str, driver=None,
+                         max_results: int = GUEST_MAX_RESULTS) -> Iterator[Dict[str, str]]:
+    """
+    Scrape LinkedIn jobs from the given URL.
+    
+    Uses the guest jobs endpoint when it works and falls back to a real browser when it is
+    rate-limited or returns nothing. Jobs are yielded as they are extracted; wrap the call in
+    list() if you need them all at once.
+    
+    Args:
+        url: LinkedIn jobs search URL
+        driver: Optional WebDriver to reuse for the browser fallback (see scrape_with_browser)
+        max_results: Maximum number of guest API results to page through
+    
+    Yields:
+        Dictionaries with 'title', 'company' and 'link' keys
+    """
+    jobs = scrape_via_guest_api(url, max_results)
+    if jobs:
+        yield from jobs
+        return
+    
+    print("Falling back to browser scraping...")
+    yield from scrape_with_browser(url, driver)
+
+
+def scrape_with_browser(url: str, driver=None) -> Iterator[Dict[str, str]]:
+    """
+    Scrape LinkedIn jobs from the given URL by rendering the page in Chrome.
+    
+    Jobs are yielded one at a time while the extracted links are processed. A supplied driver
+    is busy until the generator is exhausted or closed.
+    
+    Args:
+        url: LinkedIn jobs search URL
+        driver: Optional WebDriver to reuse (e.g. from a DriverPool); the caller keeps
+            ownership of it. If omitted, a driver is started and quit for this call.
+    
+    Yields:
+        Dictionaries with 'title', 'company' and 'link' keys
+    """
+    count = 0
+    owns_driver = driver is None
     
     try:
-        driver = setup_driver()
+        if owns_driver:
+            driver = setup_driver()
         print(f"Navigating to: {url}")
         driver.get(url)
         
-        # Wait for page to load
+        # Wait until the first job card/link is in the DOM rather than sleeping a fixed time
         print("Waiting for page to load...")
-        time.sleep(5)
+        try:
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, _JOB_CARD_SEL)))
+        except TimeoutException:
+            print("No job cards appeared within 10s, continuing anyway...")
         
         # Scroll down multiple times to load all lazy-loaded jobs
         print("Scrolling to load all jobs (LinkedIn uses lazy loading)...")
@@ -61,382 +419,191 @@ def scrape_linkedin_jobs(url: str) -> List[Dict[str, str]]:
         while scroll_attempts < max_scrolls:
             # Scroll to bottom
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for content to load
-            
-            # Calculate new scroll height
-            new_height = driver.execute_script("return document.body.scrollHeight")
             
-            if new_height == last_height:
-                # No new content loaded, try scrolling by smaller increments
-                driver.execute_script("window.scrollBy(0, 500);")
-                time.sleep(1)
+            # Wait for lazy-loaded content to grow the page rather than sleeping a fixed time
+            try:
+                WebDriverWait(driver, 3).until(
+                    lambda d: d.execute_script("return document.body.scrollHeight") != last_height)
+            except TimeoutException:
+                # No new content loaded
                 break
             
-            last_height = new_height
+            last_height = driver.execute_script("return document.body.scrollHeight")
             scroll_attempts += 1
-            print(f"  Scroll {scroll_attempts}: Found {new_height}px height")
-        
-        # Wait a bit more for any remaining content
-        time.sleep(2)
+            print(f"  Scroll {scroll_attempts}: Found {last_height}px height")
         
-        # Primary approach: Find all job links directly (most reliable)
+        # Primary approach: extract every job link and its card's text in one in-page script
         print("\nSearching for job links...")
-        job_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/jobs/view/']")
-        print(f"Found {len(job_links)} job link elements")
+        raw_jobs = driver.execute_script(_EXTRACT_JOBS_JS, _JOB_LINK_SEL, _PARENT_SEL, _TITLE_SEL, _COMPANY_SEL)
+        print(f"Found {len(raw_jobs)} job link elements")
         
+        # Links already emitted, keyed without the query string (tracking parameters differ per card)
         seen_links = set()
         
-        for link_elem in job_links:
-            try:
-                href = link_elem.get_attribute('href')
-                if not href or href in seen_links:
-                    continue
-                
-                # Clean the link (remove query parameters that might make it look different)
-                clean_href = href.split('?')[0] if '?' in href else href
-                if clean_href in seen_links:
-                    continue
-                
-                seen_links.add(clean_href)
-                seen_links.add(href)  # Also track the original
-                
-                # Try to get title and company from various locations with improved methods
-                title = None
-                company = None
-                link_text = None
-                
-                # Method 1: Extract title and company from URL (very reliable, doesn't depend on page structure!)
-                try:
-                    # LinkedIn URL format: /jobs/view/job-title-slug-at-company-name-jobid
-                    # Example: /jobs/view/software-engineer-intern-at-docusign-4322361530
-                    if '/jobs/view/' in href:
-                        # Extract the slug part (everything after /jobs/view/ and before ?)
-                        slug_part = href.split('/jobs/view/')[1].split('?')[0]
-                        # Remove the job ID at the end (trailing numbers after last dash)
-                        slug_clean = re.sub(r'-\d+$', '', slug_part)
-                        # Split by "at" to separate title from company
-                        if '-at-' in slug_clean.lower():
-                            parts = slug_clean.rsplit('-at-', 1)
-                            title_part = parts[0]
-                            company_part = parts[1] if len(parts) > 1 else None
-                            # Replace dashes with spaces and title case it
-                            title_from_url = title_part.replace('-', ' ').title()
-                            if title_from_url and len(title_from_url) > 3:
-                                title = title_from_url
-                            # Extract company name
-                            if company_part:
-                                company_from_url = company_part.replace('-', ' ').title()
-                                if company_from_url and len(company_from_url) > 1:
-                                    company = company_from_url
-                        else:
-                            # No company in URL, just extract title
-                            title_part = slug_clean
-                            title_from_url = title_part.replace('-', ' ').title()
-                            if title_from_url and len(title_from_url) > 3:
-                                title = title_from_url
-                except:
-                    pass
-                
+        for raw_job in raw_jobs:
+            href = raw_job['href']
+            if not href:
+                continue
+            
+            clean_href = href.partition('?')[0]
+            if clean_href in seen_links:
+                continue
+            seen_links.add(clean_href)
+            
+            # Try to get title and company from various locations with improved methods
+            title = None
+            company = None
+            
+            # Method 1: Extract title and company from URL (very reliable, doesn't depend on page structure!)
+            # LinkedIn URL format: /jobs/view/job-title-slug-at-company-name-jobid
+            # Example: /jobs/view/software-engineer-intern-at-docusign-4322361530
+            match = _JOB_SLUG_RE.search(href) or _JOB_SLUG_NO_COMPANY_RE.search(href)
+            if match:
+                # Replace dashes with spaces and title case it
+                title_from_url = match.group('title').replace('-', ' ').title()
+                if len(title_from_url) > 3:
+                    title = title_from_url
+                company_slug = match.groupdict().get('company')
+                if company_slug:
+                    company_from_url = company_slug.replace('-', ' ').title()
+                    if len(company_from_url) > 1:
+                        company = company_from_url
+            
+            # The slug usually has both; only consult the card fields for what it didn't give us
+            if not (title and company):
                 # Method 2: Try to get title from the link element itself
                 if not title:
-                    try:
-                        link_text = link_elem.text.strip()
-                        if link_text and len(link_text) > 3 and link_text.lower() != "view job":
-                            title = link_text
-                    except:
-                        pass
+                    link_text = raw_job['text']
+                    if link_text and len(link_text) > 3 and link_text.lower() != "view job":
+                        title = link_text
                 
-                # Method 3: Try specific LinkedIn selectors in parent container
+                # Method 3: Title selectors, headings, then title-like spans/divs in the job card
                 if not title:
-                    try:
-                        # Find the parent container (job card) - try multiple levels
-                        parent = None
-                        try:
-                            parent = link_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'job') or contains(@class, 'card') or contains(@class, 'result') or contains(@class, 'base-card')][1]")
-                        except:
-                            try:
-                                parent = link_elem.find_element(By.XPATH, "./ancestor::li[contains(@class, 'job') or contains(@class, 'result')][1]")
-                            except:
-                                parent = link_elem.find_element(By.XPATH, "./..")
-                        
-                        if parent:
-                            # Try specific LinkedIn title selectors
-                            title_selectors = [
-                                "h3.base-search-card__title",
-                                "h3.job-search-card__title",
-                                "h3.job-result-card__title",
-                                "h2.job-result-card__title",
-                                "h3[class*='title']",
-                                "h2[class*='title']",
-                                "a.job-search-card__title-link",
-                                "span.job-search-card__title",
-                                "h3",
-                                "h2"
-                            ]
-                            
-                            for selector in title_selectors:
-                                try:
-                                    title_elem = parent.find_element(By.CSS_SELECTOR, selector)
-                                    text = title_elem.text.strip()
-                                    if text and len(text) > 3 and text != link_text and text.lower() not in ['view job', 'apply', 'save']:
-                                        title = text
-                                        break
-                                except:
-                                    continue
-                            
-                            # If still no title, try to find any heading element
-                            if not title:
-                                try:
-                                    headings = parent.find_elements(By.CSS_SELECTOR, "h1, h2, h3, h4")
-                                    for heading in headings:
-                                        text = heading.text.strip()
-                                        if text and len(text) > 3 and text != link_text:
-                                            title = text
-                                            break
-                                except:
-                                    pass
-                            
-                            # Also try spans and divs that might contain the title
-                            if not title:
-                                try:
-                                    # Look for spans/divs with title-like classes or attributes
-                                    title_candidates = parent.find_elements(By.CSS_SELECTOR, "span[class*='title'], div[class*='title'], span[aria-label], div[aria-label]")
-                                    for candidate in title_candidates:
-                                        text = candidate.text.strip()
-                                        if text and len(text) > 3 and text != link_text and text.lower() not in ['view job', 'apply', 'save']:
-                                            title = text
-                                            break
-                                except:
-                                    pass
-                    except Exception as e:
-                        pass
+                    title = raw_job['title']
                 
-                # Method 4: Try to find title by looking at aria-label
+                # Method 4: Try aria-label on the link, then job-related aria-labels in the card
                 if not title:
-                    try:
-                        aria_label = link_elem.get_attribute('aria-label')
-                        if aria_label and len(aria_label) > 3:
-                            title = aria_label
-                    except:
-                        pass
-                    
-                    # Also try aria-label from parent
-                    if not title:
-                        try:
-                            parent = link_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'job') or contains(@class, 'card')][1]")
-                            aria_elements = parent.find_elements(By.CSS_SELECTOR, "[aria-label]")
-                            for elem in aria_elements:
-                                aria_text = elem.get_attribute('aria-label')
-                                if aria_text and len(aria_text) > 3 and 'job' in aria_text.lower():
-                                    title = aria_text
-                                    break
-                        except:
-                            pass
+                    aria_label = raw_job['aria']
+                    if aria_label and len(aria_label) > 3:
+                        title = aria_label
+                    else:
+                        title = raw_job['cardAria']
                 
-                # Method 5: Try to get from the first substantial text line in parent
+                # Method 5: Try to get from the first substantial text line in the card
                 if not title:
-                    try:
-                        parent = link_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'job') or contains(@class, 'card') or contains(@class, 'result')][1]")
-                        all_text = parent.text
-                        if all_text:
-                            lines = [line.strip() for line in all_text.split('\n') if line.strip() and len(line.strip()) > 3]
-                            # Filter out common non-title text
-                            skip_words = ['view job', 'apply', 'save', 'company', 'location', 'ago', 'minute', 'hour']
-                            for line in lines:
-                                line_lower = line.lower()
-                                if not any(skip in line_lower for skip in skip_words):
-                                    title = line
-                                    break
-                    except:
-                        pass
+                    lines = [line.strip() for line in raw_job['cardText'].split('\n') if line.strip() and len(line.strip()) > 3]
+                    # Filter out common non-title text
+                    for line in lines:
+                        if not _SKIP_RE.search(line):
+                            title = line
+                            break
                 
-                # Method 6: Try to extract from data attributes or other attributes
+                # Method 6: Try to extract from data attributes
                 if not title:
-                    try:
-                        parent = link_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'job') or contains(@class, 'card')][1]")
-                        # Try data attributes
-                        data_title = parent.get_attribute('data-job-title')
-                        if data_title:
-                            title = data_title
-                    except:
-                        pass
-                
+                    title = raw_job['dataTitle']
                 
-                # Try to get company from page elements if not found in URL
+                # Try to get company from the job card if not found in URL
                 if not company:
-                    try:
-                        parent = link_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'job') or contains(@class, 'card') or contains(@class, 'result') or contains(@class, 'base-card')][1]")
-                        company_selectors = [
-                            "h4.base-search-card__subtitle",
-                            "h4.job-search-card__subtitle",
-                            "a.job-search-card__subtitle-link",
-                            "h4[class*='subtitle']",
-                            "span[class*='company']",
-                            "div[class*='company']"
-                        ]
-                        for selector in company_selectors:
-                            try:
-                                company_elem = parent.find_element(By.CSS_SELECTOR, selector)
-                                company_text = company_elem.text.strip()
-                                if company_text and len(company_text) > 1:
-                                    company = company_text
-                                    break
-                            except:
-                                continue
-                    except:
-                        pass
-                
-                # If we still don't have a title, use a placeholder
-                if not title:
-                    title = "Job Listing (Title not found)"
-                
-                # If we still don't have a company, use a placeholder
-                if not company:
-                    company = "Company not found"
-                
-                jobs.append({
-                    'title': title,
-                    'company': company,
-                    'link': href
-                })
-                
-            except Exception as e:
-                print(f"  Error processing link: {e}")
-                continue
-        
-        # Secondary approach: Also try container-based extraction to catch any we missed
-        print("\nTrying container-based extraction as backup...")
-        job_selectors = [
-            "li.jobs-search-results__list-item",
-            "div.job-search-card",
-            "div.base-card",
-            "div[data-job-id]",
-            "div.job-result-card"
-        ]
-        
-        for selector in job_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    print(f"  Found {len(elements)} elements with selector: {selector}")
-                    for element in elements:
-                        try:
-                            # Try to find link in this element
-                            link_elem = element.find_element(By.CSS_SELECTOR, "a[href*='/jobs/view/']")
-                            href = link_elem.get_attribute('href')
-                            if href:
-                                clean_href = href.split('?')[0] if '?' in href else href
-                                # Check if we already have this job
-                                if clean_href not in [j['link'].split('?')[0] if '?' in j['link'] else j['link'] for j in jobs]:
-                                    # Try to get title with improved selectors
-                                    title = None
-                                    title_selectors = [
-                                        "h3.base-search-card__title",
-                                        "h3.job-search-card__title",
-                                        "h3.job-result-card__title",
-                                        "h2.job-result-card__title",
-                                        "a.job-search-card__title-link",
-                                        "h3[class*='title']",
-                                        "h2[class*='title']",
-                                        "h3",
-                                        "h2"
-                                    ]
-                                    for title_sel in title_selectors:
-                                        try:
-                                            title_elem = element.find_element(By.CSS_SELECTOR, title_sel)
-                                            title = title_elem.text.strip()
-                                            if title and len(title) > 3:
-                                                break
-                                        except:
-                                            continue
-                                    
-                                    # If still no title, try getting first substantial line of text
-                                    if not title:
-                                        try:
-                                            all_text = element.text
-                                            if all_text:
-                                                lines = [line.strip() for line in all_text.split('\n') if line.strip() and len(line.strip()) > 3]
-                                                skip_words = ['view job', 'apply', 'save', 'company', 'location', 'ago', 'minute', 'hour']
-                                                for line in lines:
-                                                    line_lower = line.lower()
-                                                    if not any(skip in line_lower for skip in skip_words):
-                                                        title = line
-                                                        break
-                                        except:
-                                            pass
-                                    
-                                    if not title:
-                                        title = "Job Listing (Title not found)"
-                                    
-                                    # Try to get company
-                                    company = None
-                                    company_selectors = [
-                                        "h4.base-search-card__subtitle",
-                                        "h4.job-search-card__subtitle",
-                                        "a.job-search-card__subtitle-link"
-                                    ]
-                                    for company_sel in company_selectors:
-                                        try:
-                                            company_elem = element.find_element(By.CSS_SELECTOR, company_sel)
-                                            company = company_elem.text.strip()
-                                            if company:
-                                                break
-                                        except:
-                                            continue
-                                    
-                                    if not company:
-                                        company = "Company not found"
-                                    
-                                    jobs.append({
-                                        'title': title,
-                                        'company': company,
-                                        'link': href
-                                    })
-                        except:
-                            continue
-            except:
-                continue
-        
-        # Remove duplicates based on link
-        seen_links = set()
-        unique_jobs = []
-        for job in jobs:
-            if job['link'] not in seen_links:
-                seen_links.add(job['link'])
-                unique_jobs.append(job)
+                    company = raw_job['company']
+            
+            # If we still don't have a title, use a placeholder
+            if not title:
+                title = "Job Listing (Title not found)"
+            
+            # If we still don't have a company, use a placeholder
+            if not company:
+                company = "Company not found"
+            
+            count += 1
+            yield {
+                'title': title,
+                'company': company,
+                'link': href
+            }
         
-        jobs = unique_jobs
-        print(f"\nSuccessfully scraped {len(jobs)} unique job postings!")
+        print(f"\nSuccessfully scraped {count} unique job postings!")
         
     except Exception as e:
         print(f"Error scraping jobs: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        if driver:
+        if owns_driver and driver:
             driver.quit()
+
+
+def scrape_many(urls: List[str], max_workers: int = MAX_BROWSERS,
+                max_results: int = GUEST_MAX_RESULTS) -> List[Dict[str, str]]:
+    """
+    Scrape several LinkedIn job search URLs concurrently.
+    
+    URLs are served from the guest jobs endpoint where possible. For the rest, each worker
+    thread checks a browser out of a shared DriverPool (WebDriver instances are
+    not thread-safe, so a driver is only ever used by one thread at a time). The threads
+    overlap the time spent waiting on page loads and driver commands, and browsers are
+    reused across URLs instead of being restarted for each one.
+    
+    Args:
+        urls: LinkedIn jobs search URLs
+        max_workers: Maximum number of browsers running at once
+        max_results: Maximum number of guest API results to page through per URL
+    
+    Returns:
+        Combined list of job dictionaries from all URLs, without duplicate links
+    """
+    workers = max(1, min(max_workers, len(urls)))
     
+    with DriverPool(workers) as pool, ThreadPoolExecutor(max_workers=workers) as executor:
+        def scrape_with_pooled_driver(url):
+            # Only check a browser out of the pool if the guest endpoint can't serve this URL
+            jobs = scrape_via_guest_api(url, max_results)
+            if jobs:
+                return jobs
+            
+            driver = pool.acquire()
+            try:
+                return list(scrape_with_browser(url, driver))
+            finally:
+                pool.release(driver)
+        
+        results = list(executor.map(scrape_with_pooled_driver, urls))
+    
+    # The same posting found by two searches differs only in its tracking query string
+    seen_links = set()
+    jobs = []
+    for url_jobs in results:
+        for job in url_jobs:
+            clean_link = job['link'].partition('?')[0]
+            if clean_link not in seen_links:
+                seen_links.add(clean_link)
+                jobs.append(job)
     return jobs
 
 
 def main():
     """Main function."""
-    # Default URL - can be changed via command line or environment variable
+    # Default URL - can be changed via command line (one or more URLs) or environment variable
     import sys
-    import os
     
     if len(sys.argv) > 1:
-        url = sys.argv[1]
+        urls = sys.argv[1:]
     else:
-        url = os.getenv('LINKEDIN_URL', 
-            'https://www.linkedin.com/jobs/search/?keywords=software%20engineer%20intern&f_TPR=r8600&f_E=1')
+        urls = [os.getenv('LINKEDIN_URL', 
+            'https://www.linkedin.com/jobs/search/?keywords=software%20engineer%20intern&f_TPR=r8600&f_E=1')]
     
     print("=" * 60)
     print("LinkedIn Job Scraper")
     print("=" * 60)
-    print(f"URL: {url}\n")
+    for url in urls:
+        print(f"URL: {url}")
+    print()
+    
+    max_results = int(os.getenv('MAX_RESULTS', GUEST_MAX_RESULTS))
     
-    jobs = scrape_linkedin_jobs(url)
+    if len(urls) == 1:
+        jobs = list(scrape_linkedin_jobs(urls[0], max_results=max_results))
+    else:
+        jobs = scrape_many(urls, max_results=max_results)
     
     print("\n" + "=" * 60)
     print("RESULTS")
@@ -453,7 +620,7 @@ def main():
         print("1. LinkedIn requires login")
         print("2. The page structure has changed")
         print("3. No jobs match the search criteria")
-        print("\nTry running with a visible browser (headless mode disabled) to debug.")
+        print("\nTry running with a visible browser (HEADFUL=1 python scrape.py) to debug.")
     
     print("\n" + "=" * 60)
     